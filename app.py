@@ -3,8 +3,9 @@ import os
 import shutil
 from dotenv import load_dotenv
 from backend.ingestion import load_documents, create_vector_db, get_vector_store
-from backend.rag_agent import generate_test_cases, generate_selenium_script
-from backend.utils import save_uploaded_file, read_file_content
+from backend.rag_agent import stream_test_cases, stream_selenium_script
+from backend.utils import save_uploaded_file, uploaded_files_hash
+from backend import semantic_cache
 from backend.qa_validator import validate_project
 
 # Load environment variables from .env file
@@ -61,6 +62,12 @@ if not api_key:
     st.info("💡 **How to fix:** Create a `.env` file in the project root and add: `GOOGLE_API_KEY=your_api_key_here`")
     st.stop()
 
+def get_session_vector_store():
+    """Reuse one vector store handle across reruns; reset on Knowledge Base builds."""
+    if st.session_state.get('vector_store') is None:
+        st.session_state['vector_store'] = get_vector_store()
+    return st.session_state['vector_store']
+
 # Tabs
 tab1, tab2, tab3 = st.tabs(["📚 Knowledge Base", "🧪 Test Cases", "📜 Selenium Scripts"])
 
@@ -78,54 +85,69 @@ with tab1:
         st.subheader("Upload Target HTML")
         uploaded_html = st.file_uploader("Upload checkout.html", type=['html'])
 
-    if st.button("Build Knowledge Base"):
+    build_col, rebuild_col = st.columns([1, 4])
+    with build_col:
+        build_clicked = st.button("Build Knowledge Base")
+    with rebuild_col:
+        force_rebuild = st.button("Force Full Rebuild", help="Delete the vector database and re-embed every document.")
+
+    if build_clicked or force_rebuild:
         if not uploaded_docs or not uploaded_html:
             st.error("Please upload both support documents and the HTML file.")
         else:
-            with st.spinner("Building Knowledge Base..."):
-                # Save files
-                base_path = os.path.join(os.getcwd(), "qa_agent", "temp_uploads")
-                if os.path.exists(base_path):
-                    shutil.rmtree(base_path)
-                os.makedirs(base_path)
-                
-                doc_paths = []
-                for doc in uploaded_docs:
-                    path = save_uploaded_file(doc, base_path)
-                    doc_paths.append(path)
-                
-                html_path = save_uploaded_file(uploaded_html, base_path)
-                # We also treat HTML as a doc for context if needed, but primarily we need it for script gen
-                # For now, let's add HTML to the vector store as well so the agent 'knows' the structure
-                # But usually, raw HTML is too noisy. Let's just keep it for the script generation phase.
-                # However, the prompt says "ingest... HTML structure". 
-                # Let's add it to doc_paths for ingestion.
-                doc_paths.append(html_path)
-                
-                # Ingest
-                docs = load_documents(doc_paths)
-                create_vector_db(docs, force_rebuild=True)
-                
-                st.success("Knowledge Base Built Successfully! 🚀")
-                st.session_state['kb_built'] = True
-                st.session_state['html_path'] = html_path
-                
-                # Run QA Validation and show suggestions
-                st.markdown("---")
-                st.subheader("🔍 Quick Fix Suggestions")
-                
-                with st.spinner("Analyzing HTML and documentation..."):
-                    # Read HTML content
-                    html_content = read_file_content(html_path)
+            kb_hash = uploaded_files_hash(list(uploaded_docs) + [uploaded_html])
+            kb_unchanged = (
+                not force_rebuild
+                and st.session_state.get('kb_hash') == kb_hash
+                and get_session_vector_store() is not None
+            )
+            if kb_unchanged:
+                st.info("Uploaded files are unchanged – reusing the existing Knowledge Base.")
+            else:
+                with st.spinner("Building Knowledge Base..."):
+                    # Save files
+                    base_path = os.path.join(os.getcwd(), "qa_agent", "temp_uploads")
+                    if os.path.exists(base_path):
+                        shutil.rmtree(base_path)
+                    os.makedirs(base_path)
+                    
+                    doc_paths = []
+                    for doc in uploaded_docs:
+                        path = save_uploaded_file(doc, base_path)
+                        doc_paths.append(path)
                     
-                    # Combine all documentation content
-                    docs_text = ""
-                    for doc_path in doc_paths[:-1]:  # Exclude HTML from docs
-                        docs_text += read_file_content(doc_path) + "\n\n"
+                    html_path = save_uploaded_file(uploaded_html, base_path)
+                    # We also treat HTML as a doc for context if needed, but primarily we need it for script gen
+                    # For now, let's add HTML to the vector store as well so the agent 'knows' the structure
+                    # But usually, raw HTML is too noisy. Let's just keep it for the script generation phase.
+                    # However, the prompt says "ingest... HTML structure". 
+                    # Let's add it to doc_paths for ingestion.
+                    doc_paths.append(html_path)
                     
-                    # Run validation
-                    suggestions = validate_project(html_content, docs_text)
-                    st.markdown(suggestions)
+                    # Ingest (only changed chunks are embedded unless a full rebuild is requested)
+                    docs, raw_texts = load_documents(doc_paths)
+                    st.session_state.pop('vector_store', None)
+                    vector_store, added, removed = create_vector_db(docs, force_rebuild=force_rebuild)
+                    st.session_state['vector_store'] = vector_store
+                    if added or removed:
+                        # Cached answers were generated against the previous documents
+                        semantic_cache.clear()
+                    
+                    st.session_state['kb_hash'] = kb_hash
+                    st.session_state['html_content'] = raw_texts.get(html_path, "")
+                    # Combine all documentation content (already read during ingestion)
+                    st.session_state['docs_text'] = "\n\n".join(raw_texts.get(p, "") for p in doc_paths[:-1])  # Exclude HTML from docs
+                
+                st.success("Knowledge Base Built Successfully! 🚀")
+            st.session_state['kb_built'] = True
+            
+            # Run QA Validation and show suggestions
+            st.markdown("---")
+            st.subheader("🔍 Quick Fix Suggestions")
+            
+            with st.spinner("Analyzing HTML and documentation..."):
+                suggestions = validate_project(st.session_state['html_content'], st.session_state['docs_text'])
+                st.markdown(suggestions)
 
 # --- Tab 2: Test Cases ---
 with tab2:
@@ -142,14 +164,13 @@ with tab2:
             elif not topic:
                 st.error("Please enter a topic.")
             else:
-                with st.spinner("Generating Test Cases..."):
-                    vector_store = get_vector_store()
-                    try:
-                        result = generate_test_cases(vector_store, topic, api_key)
-                        st.markdown(result)
-                        st.session_state['last_test_cases'] = result
-                    except Exception as e:
-                        st.error(f"Error: {e}")
+                vector_store = get_session_vector_store()
+                try:
+                    # Render tokens as they arrive instead of waiting for the full response
+                    result = st.write_stream(stream_test_cases(vector_store, topic, api_key))
+                    st.session_state['last_test_cases'] = result
+                except Exception as e:
+                    st.error(f"Error: {e}")
 
 # --- Tab 3: Selenium Scripts ---
 with tab3:
@@ -171,11 +192,14 @@ with tab3:
             elif not test_case_input:
                 st.error("Please provide a test case.")
             else:
-                with st.spinner("Generating Selenium Script..."):
-                    vector_store = get_vector_store()
-                    html_content = read_file_content(st.session_state['html_path'])
-                    try:
-                        script = generate_selenium_script(vector_store, test_case_input, html_content, api_key)
-                        st.code(script, language='python')
-                    except Exception as e:
-                        st.error(f"Error: {e}")
+                vector_store = get_session_vector_store()
+                html_content = st.session_state['html_content']
+                placeholder = st.empty()
+                try:
+                    # Re-render the code block as tokens arrive
+                    script = ""
+                    for token in stream_selenium_script(vector_store, test_case_input, html_content, api_key):
+                        script += token
+                        placeholder.code(script, language='python')
+                except Exception as e:
+                    st.error(f"Error: {e}")
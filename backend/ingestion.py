@@ -1,56 +1,105 @@
+import hashlib
 import os
 import shutil
-from typing import List
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
 
-from langchain_community.document_loaders import TextLoader, UnstructuredMarkdownLoader, JSONLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
+from langchain_classic.embeddings import CacheBackedEmbeddings
+from langchain_classic.storage import LocalFileStore
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 # Absolute path to the persistent Chroma DB folder
 VECTOR_DB_PATH = os.path.join(os.getcwd(), "qa_agent", "chroma_db")
+# On-disk cache of chunk embeddings, keyed by a hash of the chunk text
+EMBED_CACHE_PATH = os.path.join(os.getcwd(), "qa_agent", "embed_cache")
+# HNSW index parameters for the knowledge base collection. Embeddings are
+# normalised, so cosine distance is the natural metric. Chroma only applies
+# these when a collection is created; create_vector_db rebuilds a DB whose
+# collection was created with a different space.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
 
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
-def load_documents(file_paths: List[str]) -> List[Document]:
+def load_documents(file_paths: List[str]) -> Tuple[List[Document], Dict[str, str]]:
     """Load .txt, .md, and .json files into LangChain Document objects.
 
+    Each file is read from disk once; the raw text is returned alongside the
+    documents so callers (e.g. QA validation) do not need to re-read it.
+
     Args:
         file_paths: List of absolute or relative file paths.
     Returns:
-        List[Document] containing the loaded text.
+        Tuple of the loaded ``List[Document]`` and a ``{path: raw_text}`` map.
     """
     documents: List[Document] = []
+    raw_texts: Dict[str, str] = {}
     for path in file_paths:
-        ext = os.path.splitext(path)[1].lower()
         try:
-            if ext == ".txt":
-                loader = TextLoader(path, encoding="utf-8")
-            elif ext == ".md":
-                loader = UnstructuredMarkdownLoader(path)
-            elif ext == ".json":
-                # Load JSON as plain text – you can replace this with a schema‑aware loader later
-                loader = TextLoader(path, encoding="utf-8")
-            else:
-                # Fallback to generic text loader
-                loader = TextLoader(path, encoding="utf-8")
-            documents.extend(loader.load())
+            # .txt, .md and .json (as plain text – you can replace this with a
+            # schema‑aware loader later) are all ingested verbatim; markdown
+            # syntax is light enough that the embedder and the LLM handle it as-is.
+            text = Path(path).read_text(encoding="utf-8")
+            raw_texts[path] = text
+            documents.append(Document(page_content=text, metadata={"source": path}))
         except Exception as e:
             print(f"[ERROR] Failed to load {path}: {e}")
-    return documents
+    return documents, raw_texts
 
+@lru_cache(maxsize=1)
 def _get_embedding_function() -> HuggingFaceEmbeddings:
     """Create the embedding model used throughout the project.
 
     Using ``all-MiniLM-L6-v2`` provides a good speed/accuracy trade‑off for
-    local CPU inference.
+    local CPU inference. The instance is memoised so the transformer is
+    loaded only once per process (Streamlit reruns share the process).
+    """
+    return HuggingFaceEmbeddings(
+        model_name="all-MiniLM-L6-v2",
+        model_kwargs={"device": "cpu"},
+        encode_kwargs={"normalize_embeddings": True, "batch_size": 64},
+    )
+
+@lru_cache(maxsize=1)
+def _get_cached_embedding_function() -> CacheBackedEmbeddings:
+    """Wrap the embedding model with a persistent per-chunk embedding cache.
+
+    Unchanged chunks produce identical text (and hash keys) across rebuilds,
+    so only new or edited chunks go through the MiniLM forward pass.
+    """
+    store = LocalFileStore(EMBED_CACHE_PATH)
+    return CacheBackedEmbeddings.from_bytes_store(
+        _get_embedding_function(), store, namespace="minilm-l6-v2"
+    )
+
+def _split_documents(documents: List[Document]) -> List[Document]:
+    """Split documents into overlapping chunks for embedding."""
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, add_start_index=True)
+    return text_splitter.split_documents(documents)
+
+def _chunk_id(chunk: Document) -> str:
+    """Derive a deterministic id from a chunk's source, offset and text.
+
+    Unchanged chunks keep the same id across uploads, which lets an existing
+    collection be synced by adding and deleting ids instead of being rebuilt.
     """
-    return HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    digest = hashlib.sha256()
+    digest.update(os.path.basename(str(chunk.metadata.get("source", ""))).encode("utf-8"))
+    digest.update(str(chunk.metadata.get("start_index", "")).encode("utf-8"))
+    digest.update(chunk.page_content.encode("utf-8"))
+    return digest.hexdigest()
 
 # ---------------------------------------------------------------------------
 # Vector store creation / retrieval
@@ -68,39 +117,91 @@ def _reset_chroma_client(path: str) -> None:
     except Exception as e:
         print(f"[WARN] Unable to reset Chroma client: {e}")
 
-def create_vector_db(documents: List[Document], force_rebuild: bool = False) -> Chroma:
-    """Create or rebuild the Chroma vector store safely.
+def _remove_vector_db() -> None:
+    """Delete the persistent DB folder, tolerating locked files on Windows."""
+    _reset_chroma_client(VECTOR_DB_PATH)
+    try:
+        shutil.rmtree(VECTOR_DB_PATH)
+    except PermissionError as pe:
+        print(f"[WARN] PermissionError while deleting DB folder: {pe}. Retrying with ignore_errors.")
+        shutil.rmtree(VECTOR_DB_PATH, ignore_errors=True)
+    except Exception as e:
+        print(f"[ERROR] Unexpected error while removing DB folder: {e}")
+    # Chroma caches one client per path; drop it so the next client does not
+    # write through handles to the deleted files
+    try:
+        try:
+            from chromadb.api.shared_system_client import SharedSystemClient
+        except ImportError:  # chromadb < 0.6
+            from chromadb.api.client import SharedSystemClient
+        SharedSystemClient.clear_system_cache()
+    except Exception as e:
+        print(f"[WARN] Unable to clear Chroma client cache: {e}")
+
+def _uses_expected_space(db: Chroma) -> bool:
+    """Return whether the collection was created with ``HNSW_METADATA``'s distance space.
+
+    Collections created before the HNSW settings were introduced use Chroma's
+    default ``l2`` space, which distance thresholds elsewhere do not expect.
+    """
+    metadata = db._collection.metadata or {}
+    return metadata.get("hnsw:space", "l2") == HNSW_METADATA["hnsw:space"]
+
+def create_vector_db(documents: List[Document], force_rebuild: bool = False) -> Tuple[Chroma, int, int]:
+    """Create, update or rebuild the Chroma vector store safely.
+
+    Returns the store together with the number of chunks added and removed,
+    so callers can tell whether the knowledge base actually changed.
 
-    * ``force_rebuild`` – delete the existing DB folder and start fresh.
+    * If the DB already exists it is synced in place: chunks that are new are
+      embedded and added, chunks that disappeared are deleted, and unchanged
+      chunks are left untouched.
+    * ``force_rebuild`` – delete the existing DB folder and start fresh. This
+      also happens automatically when the existing collection uses a
+      different distance space than ``HNSW_METADATA``.
     * On Windows the DB folder can be locked; we first reset the persistent
       client and then attempt removal, falling back to ``ignore_errors=True``.
     """
-    embeddings = _get_embedding_function()
+    embeddings = _get_cached_embedding_function()
+
+    if not force_rebuild and os.path.isdir(VECTOR_DB_PATH):
+        existing = Chroma(persist_directory=VECTOR_DB_PATH, embedding_function=embeddings, collection_metadata=HNSW_METADATA)
+        if not _uses_expected_space(existing):
+            print("[INFO] Existing vector database uses a different distance metric; rebuilding.")
+            force_rebuild = True
+        del existing
 
     if force_rebuild and os.path.isdir(VECTOR_DB_PATH):
-        _reset_chroma_client(VECTOR_DB_PATH)
-        try:
-            shutil.rmtree(VECTOR_DB_PATH)
-        except PermissionError as pe:
-            print(f"[WARN] PermissionError while deleting DB folder: {pe}. Retrying with ignore_errors.")
-            shutil.rmtree(VECTOR_DB_PATH, ignore_errors=True)
-        except Exception as e:
-            print(f"[ERROR] Unexpected error while removing DB folder: {e}")
+        _remove_vector_db()
+
+    chunks_by_id = {_chunk_id(chunk): chunk for chunk in _split_documents(documents)}
 
     if not os.path.isdir(VECTOR_DB_PATH):
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, add_start_index=True)
-        chunks = text_splitter.split_documents(documents)
-        db = Chroma.from_documents(documents=chunks, embedding=embeddings, persist_directory=VECTOR_DB_PATH)
+        db = Chroma.from_documents(
+            documents=list(chunks_by_id.values()),
+            embedding=embeddings,
+            ids=list(chunks_by_id),
+            persist_directory=VECTOR_DB_PATH,
+            collection_metadata=HNSW_METADATA,
+        )
         print("[INFO] Vector database created at", VECTOR_DB_PATH)
-        return db
-    else:
-        print("[INFO] Loading existing vector database from", VECTOR_DB_PATH)
-        return Chroma(persist_directory=VECTOR_DB_PATH, embedding_function=embeddings)
+        return db, len(chunks_by_id), 0
+
+    db = Chroma(persist_directory=VECTOR_DB_PATH, embedding_function=embeddings, collection_metadata=HNSW_METADATA)
+    existing_ids = set(db.get(include=[])["ids"])
+    new_ids = [chunk_id for chunk_id in chunks_by_id if chunk_id not in existing_ids]
+    stale_ids = list(existing_ids - chunks_by_id.keys())
+    if stale_ids:
+        db.delete(ids=stale_ids)
+    if new_ids:
+        db.add_documents([chunks_by_id[chunk_id] for chunk_id in new_ids], ids=new_ids)
+    print(f"[INFO] Vector database updated at {VECTOR_DB_PATH}: {len(new_ids)} added, {len(stale_ids)} removed")
+    return db, len(new_ids), len(stale_ids)
 
 def get_vector_store() -> Chroma | None:
     """Return the existing vector store if it has been created, otherwise ``None``.
     """
     if not os.path.isdir(VECTOR_DB_PATH):
         return None
-    embeddings = _get_embedding_function()
-    return Chroma(persist_directory=VECTOR_DB_PATH, embedding_function=embeddings)
+    embeddings = _get_cached_embedding_function()
+    return Chroma(persist_directory=VECTOR_DB_PATH, embedding_function=embeddings, collection_metadata=HNSW_METADATA)
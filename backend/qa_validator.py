@@ -2,9 +2,17 @@
 QA Validator - Provides intelligent suggestions for missing elements and validation rules
 """
 from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
 import re
 
+# Patterns used to locate elements, compiled once at import
+_RE_EMAIL = re.compile('email', re.I)
+_RE_NAME = re.compile('name|fullname', re.I)
+_RE_DISCOUNT = re.compile('discount|coupon', re.I)
+_RE_DISCOUNT_ERR = re.compile('discount.*error|discount.*msg', re.I)
+_RE_PAYMENT = re.compile('payment', re.I)
+_RE_SHIPPING = re.compile('shipping', re.I)
+_RE_APPLY = re.compile('apply', re.I)
 
 class QAValidator:
     """Validates HTML and documentation for common QA issues and provides suggestions"""
@@ -12,22 +20,54 @@ class QAValidator:
     def __init__(self, html_content: str, docs_content: str = ""):
         self.html_content = html_content
         self.docs_content = docs_content
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+        self._docs_lower = docs_content.lower()
+        self.soup = BeautifulSoup(html_content, 'lxml')
         self.suggestions = []
     
     def validate_all(self) -> List[Dict[str, str]]:
         """Run all validation checks and return suggestions"""
         self.suggestions = []
+        if not self.html_content.strip():
+            return self.suggestions
         
-        self._check_form_validation()
-        self._check_error_messages()
-        self._check_discount_code_elements()
-        self._check_payment_elements()
-        self._check_shipping_elements()
-        self._check_documentation_coverage()
+        inputs, buttons, ids = self._collect_elements()
+        if not inputs and not buttons:
+            return self.suggestions
+        
+        self._check_form_validation(inputs)
+        self._check_error_messages(inputs, ids)
+        self._check_discount_code_elements(inputs, buttons)
+        self._check_payment_elements(inputs)
+        self._check_shipping_elements(inputs)
+        self._check_documentation_coverage(buttons)
         
         return self.suggestions
     
+    def _collect_elements(self) -> Tuple[list, list, Set[str]]:
+        """Walk the DOM once and bucket the elements the checks need"""
+        inputs = []
+        buttons = []
+        ids = set()
+        for tag in self.soup.find_all(True):
+            if tag.name == 'input':
+                inputs.append(tag)
+            elif tag.name == 'button':
+                buttons.append(tag)
+            tag_id = tag.get('id')
+            if tag_id:
+                ids.add(tag_id)
+        return inputs, buttons, ids
+    
+    @staticmethod
+    def _first_input_with_id(inputs: list, pattern: re.Pattern):
+        """Return the first input whose id matches the pattern"""
+        return next((i for i in inputs if i.get('id') and pattern.search(i['id'])), None)
+    
+    @staticmethod
+    def _radios_named(inputs: list, pattern: re.Pattern) -> list:
+        """Return radio inputs whose name matches the pattern"""
+        return [i for i in inputs if i.get('type') == 'radio' and i.get('name') and pattern.search(i['name'])]
+    
     def _add_suggestion(self, category: str, issue: str, suggestion: str, severity: str = "warning"):
         """Add a suggestion to the list"""
         self.suggestions.append({
@@ -37,13 +77,13 @@ class QAValidator:
             "severity": severity  # info, warning, error
         })
     
-    def _check_form_validation(self):
+    def _check_form_validation(self, inputs: list):
         """Check if form fields have proper validation"""
         # Check for email field
-        email_field = self.soup.find('input', {'type': 'email'}) or self.soup.find('input', {'id': re.compile('email', re.I)})
+        email_field = next((i for i in inputs if i.get('type') == 'email'), None) or self._first_input_with_id(inputs, _RE_EMAIL)
         if email_field:
             # Check if validation rules are documented
-            if 'email' not in self.docs_content.lower() and 'validation' not in self.docs_content.lower():
+            if 'email' not in self._docs_lower and 'validation' not in self._docs_lower:
                 self._add_suggestion(
                     "Form Validation",
                     "Email field requires validation, but no validation rule found in documents.",
@@ -52,10 +92,10 @@ class QAValidator:
                 )
         
         # Check for required fields
-        required_fields = self.soup.find_all('input', {'required': True})
+        required_fields = [i for i in inputs if i.has_attr('required')]
         if not required_fields:
             # Check if there are inputs that should be required
-            name_field = self.soup.find('input', {'id': re.compile('name|fullname', re.I)})
+            name_field = self._first_input_with_id(inputs, _RE_NAME)
             if name_field and not name_field.get('required'):
                 self._add_suggestion(
                     "Form Validation",
@@ -64,15 +104,13 @@ class QAValidator:
                     "info"
                 )
     
-    def _check_error_messages(self):
+    def _check_error_messages(self, inputs: list, ids: Set[str]):
         """Check if error message elements exist"""
-        error_elements = self.soup.find_all(class_=re.compile('error', re.I))
-        
         # Check for discount code error
-        discount_input = self.soup.find('input', {'id': re.compile('discount|coupon', re.I)})
+        discount_input = self._first_input_with_id(inputs, _RE_DISCOUNT)
         if discount_input:
             # Look for associated error message element
-            discount_error = self.soup.find(id=re.compile('discount.*error|discount.*msg', re.I))
+            discount_error = any(_RE_DISCOUNT_ERR.search(i) for i in ids)
             if not discount_error:
                 self._add_suggestion(
                     "Error Handling",
@@ -82,12 +120,12 @@ class QAValidator:
                 )
         
         # Check for form field errors
-        form_inputs = self.soup.find_all('input', {'type': ['text', 'email']})
+        form_inputs = [i for i in inputs if i.get('type') in ('text', 'email')]
         for input_field in form_inputs:
             field_id = input_field.get('id', '')
             if field_id:
                 error_id = f"error-{field_id}"
-                if not self.soup.find(id=error_id):
+                if error_id not in ids:
                     self._add_suggestion(
                         "Error Handling",
                         f"Missing error message element for '{field_id}' field.",
@@ -95,106 +133,109 @@ class QAValidator:
                         "info"
                     )
     
-    def _check_discount_code_elements(self):
+    def _check_discount_code_elements(self, inputs: list, buttons: list):
         """Check discount code functionality elements"""
-        discount_input = self.soup.find('input', {'id': re.compile('discount|coupon', re.I)})
+        discount_input = self._first_input_with_id(inputs, _RE_DISCOUNT)
+        if not discount_input:
+            return
         
-        if discount_input:
-            # Check for apply button
-            apply_btn = self.soup.find('button', string=re.compile('apply', re.I))
-            if not apply_btn:
-                self._add_suggestion(
-                    "Discount Code",
-                    "Discount input found but no 'Apply' button detected.",
-                    "Add a button with text 'Apply' to trigger discount code validation.",
-                    "error"
-                )
-            
-            # Check if discount codes are documented
-            if 'discount' not in self.docs_content.lower() and 'coupon' not in self.docs_content.lower():
-                self._add_suggestion(
-                    "Documentation",
-                    "Discount code feature exists in HTML but not documented.",
-                    "Add discount code specifications to product_specs.md (e.g., valid codes, discount percentages).",
-                    "warning"
-                )
+        # Check for apply button
+        apply_btn = any(btn.string and _RE_APPLY.search(btn.string) for btn in buttons)
+        if not apply_btn:
+            self._add_suggestion(
+                "Discount Code",
+                "Discount input found but no 'Apply' button detected.",
+                "Add a button with text 'Apply' to trigger discount code validation.",
+                "error"
+            )
+        
+        # Check if discount codes are documented
+        if 'discount' not in self._docs_lower and 'coupon' not in self._docs_lower:
+            self._add_suggestion(
+                "Documentation",
+                "Discount code feature exists in HTML but not documented.",
+                "Add discount code specifications to product_specs.md (e.g., valid codes, discount percentages).",
+                "warning"
+            )
     
-    def _check_payment_elements(self):
+    def _check_payment_elements(self, inputs: list):
         """Check payment method elements"""
-        payment_radios = self.soup.find_all('input', {'type': 'radio', 'name': re.compile('payment', re.I)})
+        # Nothing to report if payment methods are documented
+        if 'payment' in self._docs_lower:
+            return
         
+        payment_radios = self._radios_named(inputs, _RE_PAYMENT)
         if payment_radios:
             payment_methods = [radio.get('value', '') for radio in payment_radios]
-            
-            # Check if payment methods are documented
-            if 'payment' not in self.docs_content.lower():
-                self._add_suggestion(
-                    "Documentation",
-                    "Payment methods found in HTML but not documented.",
-                    f"Add payment method specifications to documentation. Found methods: {', '.join(payment_methods)}",
-                    "warning"
-                )
+            self._add_suggestion(
+                "Documentation",
+                "Payment methods found in HTML but not documented.",
+                f"Add payment method specifications to documentation. Found methods: {', '.join(payment_methods)}",
+                "warning"
+            )
     
-    def _check_shipping_elements(self):
+    def _check_shipping_elements(self, inputs: list):
         """Check shipping method elements"""
-        shipping_radios = self.soup.find_all('input', {'type': 'radio', 'name': re.compile('shipping', re.I)})
+        # Nothing to report if shipping rules are documented
+        if 'shipping' in self._docs_lower:
+            return
         
-        if shipping_radios:
-            # Check if shipping rules are documented
-            if 'shipping' not in self.docs_content.lower():
-                self._add_suggestion(
-                    "Documentation",
-                    "Shipping options found in HTML but not documented.",
-                    "Add shipping rules and costs to product_specs.md.",
-                    "warning"
-                )
+        if self._radios_named(inputs, _RE_SHIPPING):
+            self._add_suggestion(
+                "Documentation",
+                "Shipping options found in HTML but not documented.",
+                "Add shipping rules and costs to product_specs.md.",
+                "warning"
+            )
     
-    def _check_documentation_coverage(self):
+    def _check_documentation_coverage(self, buttons: list):
         """Check if key features are documented"""
+        if not buttons:
+            return
+        
         # Check for buttons and their purposes
-        buttons = self.soup.find_all('button')
-        for btn in buttons:
-            btn_text = btn.get_text(strip=True).lower()
-            if btn_text and btn_text not in self.docs_content.lower():
-                if btn_text not in ['apply', 'submit', 'pay']:  # Common buttons
-                    self._add_suggestion(
-                        "Documentation",
-                        f"Button '{btn.get_text(strip=True)}' found but not documented.",
-                        f"Document the purpose and behavior of the '{btn.get_text(strip=True)}' button.",
-                        "info"
-                    )
+        labels = [btn.get_text(strip=True) for btn in buttons]
+        candidates = {label.lower() for label in labels} - {'', 'apply', 'submit', 'pay'}  # Common buttons
+        if not candidates:
+            return
+        
+        # Each distinct label is searched for once, however many buttons share it
+        documented = {t for t in candidates if t in self._docs_lower}
+        for label in labels:
+            btn_text = label.lower()
+            if btn_text in candidates and btn_text not in documented:
+                self._add_suggestion(
+                    "Documentation",
+                    f"Button '{label}' found but not documented.",
+                    f"Document the purpose and behavior of the '{label}' button.",
+                    "info"
+                )
     
     def format_suggestions_markdown(self) -> str:
         """Format suggestions as markdown for display"""
         if not self.suggestions:
             return "✅ **No issues found!** Your HTML and documentation are well-structured."
         
-        md = "## 🔍 Quick Fix Suggestions\n\n"
-        
-        # Group by severity
-        errors = [s for s in self.suggestions if s['severity'] == 'error']
-        warnings = [s for s in self.suggestions if s['severity'] == 'warning']
-        info = [s for s in self.suggestions if s['severity'] == 'info']
-        
-        if errors:
-            md += "### 🚨 Critical Issues\n"
-            for s in errors:
-                md += f"**{s['category']}**: {s['issue']}\n"
-                md += f"💡 *Fix*: {s['suggestion']}\n\n"
+        parts = ["## 🔍 Quick Fix Suggestions\n\n"]
         
-        if warnings:
-            md += "### ⚠️ Warnings\n"
-            for s in warnings:
-                md += f"**{s['category']}**: {s['issue']}\n"
-                md += f"💡 *Fix*: {s['suggestion']}\n\n"
+        # Group by severity in a single pass
+        buckets = {'error': [], 'warning': [], 'info': []}
+        for s in self.suggestions:
+            buckets.setdefault(s['severity'], []).append(s)
         
-        if info:
-            md += "### ℹ️ Recommendations\n"
-            for s in info:
-                md += f"**{s['category']}**: {s['issue']}\n"
-                md += f"💡 *Fix*: {s['suggestion']}\n\n"
+        sections = [
+            ('error', "### 🚨 Critical Issues\n"),
+            ('warning', "### ⚠️ Warnings\n"),
+            ('info', "### ℹ️ Recommendations\n"),
+        ]
+        for severity, heading in sections:
+            if buckets[severity]:
+                parts.append(heading)
+                for s in buckets[severity]:
+                    parts.append(f"**{s['category']}**: {s['issue']}\n")
+                    parts.append(f"💡 *Fix*: {s['suggestion']}\n\n")
         
-        return md
+        return "".join(parts)
 
 
 def validate_project(html_content: str, docs_content: str = "") -> str:
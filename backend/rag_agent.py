@@ -1,13 +1,45 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.outputs import Generation
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_community.cache import SQLiteCache
+from backend import semantic_cache
 
 # Using Gemini 2.5 Flash - latest and fastest model
 LLM_MODEL = "gemini-2.5-flash"
 
+# Topics whose closest chunk is further than this cosine distance (1 - cosine
+# similarity, range 0-2) are treated as not covered by the knowledge base, and
+# the LLM call is skipped. MiniLM places unrelated text at a similarity of
+# roughly 0-0.2, while short feature queries against their spec chunks
+# typically score 0.3 or more.
+RELEVANCE_DISTANCE_THRESHOLD = 0.8
+
+# Persistent exact-match cache for LLM responses (keyed on prompt + model params)
+LLM_CACHE_PATH = os.path.join(os.getcwd(), "qa_agent", ".llm_cache.db")
+# temperature=0 (see _create_llm) makes the model name + temperature a stable
+# "llm string" half of the cache key; the rendered prompt is the other half
+LLM_CACHE_KEY = f"{LLM_MODEL}:temperature=0"
+_llm_cache_installed = False
+
+def _install_llm_cache():
+    """
+    Installs the global SQLite LLM cache once per process so identical
+    prompts skip the Gemini round-trip (see _stream_llm).
+    """
+    global _llm_cache_installed
+    if _llm_cache_installed:
+        return
+    os.makedirs(os.path.dirname(LLM_CACHE_PATH), exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+    _llm_cache_installed = True
+
+_install_llm_cache()
+
 def get_llm(api_key=None):
     """
     Returns the Gemini LLM instance.
@@ -18,8 +50,40 @@ def get_llm(api_key=None):
     if not api_key:
         raise ValueError("Google API Key is missing.")
 
+    return _create_llm(api_key)
+
+@lru_cache(maxsize=4)
+def _create_llm(api_key: str):
+    """
+    Creates the Gemini client once per API key and reuses it across calls.
+    """
+    # temperature=0 keeps (prompt, model, temperature) a stable cache key
     return ChatGoogleGenerativeAI(model=LLM_MODEL, temperature=0, google_api_key=api_key)
 
+def _stream_llm(prompt_value, api_key: str):
+    """
+    Streams the LLM response for a rendered prompt.
+
+    Chat model streaming bypasses the global LLM cache, so the cache is
+    consulted before the call and filled once the stream has completed.
+    """
+    llm = get_llm(api_key)
+    cache = get_llm_cache()
+    prompt_key = prompt_value.to_string()
+    if cache is not None:
+        cached = cache.lookup(prompt_key, LLM_CACHE_KEY)
+        if cached:
+            yield cached[0].text
+            return
+
+    parts = []
+    for token in (llm | StrOutputParser()).stream(prompt_value):
+        parts.append(token)
+        yield token
+    if cache is not None:
+        cache.update(prompt_key, LLM_CACHE_KEY, [Generation(text="".join(parts))])
+
+@lru_cache(maxsize=1)
 def load_prompt():
     """
     Loads the QA Architect Master Prompt.
@@ -30,13 +94,11 @@ def load_prompt():
         raise FileNotFoundError(f"Prompt file not found at {prompt_path}")
     return prompt_path.read_text(encoding="utf-8")
 
-def generate_test_cases(vector_store, topic: str, api_key: str):
+@lru_cache(maxsize=1)
+def _testcase_prompt():
     """
-    Generates test cases based on the topic and knowledge base.
+    Builds the Phase 1 (test case generation) prompt template once.
     """
-    llm = get_llm(api_key)
-    retriever = vector_store.as_retriever(search_kwargs={"k": 5})
-
     master_prompt = load_prompt()
     
     # Append specific instructions for Phase 1
@@ -54,27 +116,13 @@ def generate_test_cases(vector_store, topic: str, api_key: str):
     Generate the test cases now, adhering strictly to the "TEST CASE OUTPUT FORMAT" and "Requirements" defined in the Master Prompt.
     """
     
-    prompt = ChatPromptTemplate.from_template(template)
-    
-    chain = (
-        {"context": retriever, "topic": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
-    
-    return chain.invoke(topic)
+    return ChatPromptTemplate.from_template(template)
 
-def generate_selenium_script(vector_store, test_case: str, html_content: str, api_key: str):
+@lru_cache(maxsize=1)
+def _selenium_prompt():
     """
-    Generates a Selenium script for a specific test case.
+    Builds the Phase 2 (Selenium script generation) prompt template once.
     """
-    llm = get_llm(api_key)
-    # We might want to retrieve context relevant to the test case as well, 
-    # but the HTML content is the most critical part for the script.
-    # We can also retrieve context to understand business rules if needed.
-    retriever = vector_store.as_retriever(search_kwargs={"k": 3})
-    
     master_prompt = load_prompt()
     
     # Append specific instructions for Phase 2
@@ -96,13 +144,69 @@ def generate_selenium_script(vector_store, test_case: str, html_content: str, ap
     Generate the Python Selenium script now, adhering strictly to the "Script Requirements" and template defined in the Master Prompt.
     """
     
-    prompt = ChatPromptTemplate.from_template(template)
+    return ChatPromptTemplate.from_template(template)
+
+def stream_test_cases(vector_store, topic: str, api_key: str):
+    """
+    Generates test cases based on the topic and knowledge base, yielding
+    the output incrementally as the LLM produces it.
+    """
+    cache_key = f"testcases::{topic}"
+    cached = semantic_cache.lookup(cache_key, namespace="testcases", normalize=True)
+    if cached is not None:
+        yield cached
+        return
+
+    # Retrieve once up front: it doubles as a relevance gate and as the context
+    scored_docs = vector_store.similarity_search_with_score(topic, k=5)
+    if not scored_docs or min(score for _, score in scored_docs) > RELEVANCE_DISTANCE_THRESHOLD:
+        yield f"No relevant documentation found for '{topic}'."
+        return
+    docs = [doc for doc, _ in scored_docs]
+
+    prompt_value = _testcase_prompt().invoke({"context": docs, "topic": topic})
     
-    chain = (
-        {"context": retriever, "test_case": RunnablePassthrough(), "html_content": lambda x: html_content}
-        | prompt
-        | llm
-        | StrOutputParser()
+    parts = []
+    for token in _stream_llm(prompt_value, api_key):
+        parts.append(token)
+        yield token
+    semantic_cache.store(cache_key, namespace="testcases", response="".join(parts), normalize=True)
+
+def generate_test_cases(vector_store, topic: str, api_key: str):
+    """
+    Generates test cases based on the topic and knowledge base.
+    """
+    return "".join(stream_test_cases(vector_store, topic, api_key))
+
+def stream_selenium_script(vector_store, test_case: str, html_content: str, api_key: str):
+    """
+    Generates a Selenium script for a specific test case, yielding the
+    output incrementally as the LLM produces it.
+    """
+    # Scripts are only reusable for the exact same test case and HTML
+    cache_digest = semantic_cache.content_hash(test_case, html_content)
+    cached = semantic_cache.lookup_exact(cache_digest)
+    if cached is not None:
+        yield cached
+        return
+
+    # We might want to retrieve context relevant to the test case as well, 
+    # but the HTML content is the most critical part for the script.
+    # We can also retrieve context to understand business rules if needed.
+    retriever = vector_store.as_retriever(search_kwargs={"k": 3})
+    context = retriever.invoke(test_case)
+    prompt_value = _selenium_prompt().invoke(
+        {"context": context, "test_case": test_case, "html_content": html_content}
     )
     
-    return chain.invoke(test_case)
+    parts = []
+    for token in _stream_llm(prompt_value, api_key):
+        parts.append(token)
+        yield token
+    semantic_cache.store_exact(cache_digest, f"selenium::{test_case}", namespace="selenium", response="".join(parts))
+
+def generate_selenium_script(vector_store, test_case: str, html_content: str, api_key: str):
+    """
+    Generates a Selenium script for a specific test case.
+    """
+    return "".join(stream_selenium_script(vector_store, test_case, html_content, api_key))
@@ -0,0 +1,142 @@
+"""
+Semantic Cache - Returns stored LLM responses for semantically equivalent prompts
+"""
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from langchain_chroma import Chroma
+
+from backend.ingestion import VECTOR_DB_PATH, _get_embedding_function
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+CACHE_COLLECTION = "llm_cache"
+# Maximum cosine distance between two keys that still counts as a cache hit
+DISTANCE_THRESHOLD = 0.05
+
+# In-process exact-match layer, keyed on (namespace, key or normalised key)
+_exact_cache: Dict[Tuple[str, str], str] = {}
+
+
+def _normalize(key: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so trivial variants match.
+
+    Only suitable for short topics: it erases operators and signs, so
+    e.g. "quantity -1" and "quantity 1" become the same key.
+    """
+    return re.sub(r'\W+', ' ', key.lower()).strip()
+
+
+def _exact_key(key: str, namespace: str, normalize: bool) -> Tuple[str, str]:
+    """Build the in-process exact-match key for ``key``."""
+    return namespace, _normalize(key) if normalize else key
+
+
+@lru_cache(maxsize=1)
+def _get_cache_store() -> Chroma:
+    """Open the dedicated cache collection inside the persistent Chroma DB.
+
+    The collection lives next to the knowledge base, so rebuilding the KB
+    also discards responses generated against the previous documents. The
+    handle is memoised and only reopened by :func:`clear`.
+    """
+    return Chroma(
+        collection_name=CACHE_COLLECTION,
+        persist_directory=VECTOR_DB_PATH,
+        embedding_function=_get_embedding_function(),
+        collection_metadata={"hnsw:space": "cosine"},
+    )
+
+
+def clear() -> None:
+    """Drop every cached response, e.g. after the knowledge base changes."""
+    _exact_cache.clear()
+    # The DB folder may have been removed by a forced rebuild; reopen first
+    _get_cache_store.cache_clear()
+    try:
+        _get_cache_store().reset_collection()
+    except Exception as e:
+        print(f"[WARN] Semantic cache clear failed: {e}")
+
+
+def content_hash(*parts: str) -> str:
+    """Return a stable SHA-256 digest for the given text parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def lookup(
+    key: str, namespace: str, threshold: float = DISTANCE_THRESHOLD, normalize: bool = False
+) -> Optional[str]:
+    """Return the cached response closest to ``key`` within ``namespace``.
+
+    Args:
+        key: Text that is embedded and compared against stored keys.
+        namespace: Restricts matches to entries stored under the same namespace.
+        threshold: Maximum cosine distance accepted as a hit.
+        normalize: Normalise ``key`` for the in-process exact layer (topics only).
+    Returns:
+        The cached response, or ``None`` on a miss.
+    """
+    exact = _exact_cache.get(_exact_key(key, namespace, normalize))
+    if exact is not None:
+        return exact
+    try:
+        results = _get_cache_store().similarity_search_with_score(
+            key, k=1, filter={"namespace": namespace}
+        )
+    except Exception as e:
+        print(f"[WARN] Semantic cache lookup failed: {e}")
+        return None
+    if not results:
+        return None
+    doc, distance = results[0]
+    if distance >= threshold:
+        return None
+    response = doc.metadata.get("response")
+    if response is not None:
+        _exact_cache[_exact_key(key, namespace, normalize)] = response
+    return response
+
+
+def lookup_exact(digest: str) -> Optional[str]:
+    """Return the response stored under ``digest`` by :func:`store_exact`.
+
+    Used where a near match is not good enough (e.g. scripts for test cases
+    that differ in a single value), so no similarity search is done.
+    """
+    try:
+        result = _get_cache_store().get(ids=[digest], include=["metadatas"])
+    except Exception as e:
+        print(f"[WARN] Semantic cache lookup failed: {e}")
+        return None
+    if not result["ids"]:
+        return None
+    return result["metadatas"][0].get("response")
+
+
+def store_exact(digest: str, key: str, namespace: str, response: str) -> None:
+    """Persist ``response`` under the id ``digest`` for :func:`lookup_exact`."""
+    try:
+        _get_cache_store().add_texts(
+            [key], metadatas=[{"namespace": namespace, "response": response}], ids=[digest]
+        )
+    except Exception as e:
+        print(f"[WARN] Semantic cache store failed: {e}")
+
+
+def store(key: str, namespace: str, response: str, normalize: bool = False) -> None:
+    """Persist ``response`` under the embedding of ``key``."""
+    _exact_cache[_exact_key(key, namespace, normalize)] = response
+    try:
+        _get_cache_store().add_texts(
+            [key], metadatas=[{"namespace": namespace, "response": response}]
+        )
+    except Exception as e:
+        print(f"[WARN] Semantic cache store failed: {e}")
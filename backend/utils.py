@@ -1,4 +1,6 @@
+import hashlib
 import os
+from pathlib import Path
 
 def save_uploaded_file(uploaded_file, dest_folder):
     if not os.path.exists(dest_folder):
@@ -9,6 +11,13 @@ def save_uploaded_file(uploaded_file, dest_folder):
         f.write(uploaded_file.getbuffer())
     return file_path
 
+def uploaded_files_hash(uploaded_files):
+    """Hash the names and contents of uploaded files, independent of upload order."""
+    digest = hashlib.sha256()
+    for uploaded_file in sorted(uploaded_files, key=lambda f: f.name):
+        digest.update(uploaded_file.name.encode("utf-8"))
+        digest.update(hashlib.sha256(uploaded_file.getvalue()).digest())
+    return digest.hexdigest()
+
 def read_file_content(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+    return Path(file_path).read_text(encoding="utf-8")
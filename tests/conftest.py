@@ -0,0 +1,63 @@
+import hashlib
+import math
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic bag-of-words embedder so tests never load MiniLM."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def _embed(self, text: str):
+        vector = [0.0] * 64
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % 64] += 1.0
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def _clear_chroma_clients():
+    try:
+        from chromadb.api.shared_system_client import SharedSystemClient
+    except ImportError:  # chromadb < 0.6
+        from chromadb.api.client import SharedSystemClient
+    SharedSystemClient.clear_system_cache()
+
+
+@pytest.fixture
+def fake_embedder(monkeypatch):
+    """Replace HuggingFaceEmbeddings and reset the memoised embedders."""
+    from backend import ingestion
+
+    monkeypatch.setattr(ingestion, "HuggingFaceEmbeddings", FakeEmbeddings)
+    ingestion._get_embedding_function.cache_clear()
+    ingestion._get_cached_embedding_function.cache_clear()
+    yield
+    ingestion._get_embedding_function.cache_clear()
+    ingestion._get_cached_embedding_function.cache_clear()
+
+
+@pytest.fixture
+def vector_db_path(tmp_path, monkeypatch, fake_embedder):
+    """Point the vector DB, embedding cache and semantic cache at a temp dir."""
+    from backend import ingestion, semantic_cache
+
+    db_path = str(tmp_path / "chroma_db")
+    monkeypatch.setattr(ingestion, "VECTOR_DB_PATH", db_path)
+    monkeypatch.setattr(ingestion, "EMBED_CACHE_PATH", str(tmp_path / "embed_cache"))
+    monkeypatch.setattr(semantic_cache, "VECTOR_DB_PATH", db_path)
+    semantic_cache._get_cache_store.cache_clear()
+    semantic_cache._exact_cache.clear()
+    yield db_path
+    semantic_cache._get_cache_store.cache_clear()
+    semantic_cache._exact_cache.clear()
+    _clear_chroma_clients()
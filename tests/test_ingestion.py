@@ -0,0 +1,83 @@
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+
+from backend import ingestion
+from backend.ingestion import _chunk_id, _get_embedding_function, create_vector_db, load_documents
+
+
+def _doc(text, source="specs.md"):
+    return Document(page_content=text, metadata={"source": source})
+
+
+def test_embedding_function_is_loaded_once(fake_embedder):
+    assert _get_embedding_function() is _get_embedding_function()
+
+
+def test_chunk_id_is_stable_across_upload_dirs():
+    a = Document(page_content="Discount code SAVE15", metadata={"source": "/tmp/a/specs.md", "start_index": 0})
+    b = Document(page_content="Discount code SAVE15", metadata={"source": "/tmp/b/specs.md", "start_index": 0})
+    assert _chunk_id(a) == _chunk_id(b)
+
+
+def test_chunk_id_changes_with_text_offset_or_source():
+    base = Document(page_content="Discount code SAVE15", metadata={"source": "specs.md", "start_index": 0})
+    variants = [
+        Document(page_content="Discount code SAVE20", metadata={"source": "specs.md", "start_index": 0}),
+        Document(page_content="Discount code SAVE15", metadata={"source": "specs.md", "start_index": 10}),
+        Document(page_content="Discount code SAVE15", metadata={"source": "guide.txt", "start_index": 0}),
+    ]
+    assert all(_chunk_id(v) != _chunk_id(base) for v in variants)
+
+
+def test_load_documents_returns_raw_text(tmp_path):
+    md = tmp_path / "specs.md"
+    md.write_text("# Specs\nSAVE15 gives 15%", encoding="utf-8")
+    missing = str(tmp_path / "missing.txt")
+
+    docs, raw_texts = load_documents([str(md), missing])
+
+    assert [d.page_content for d in docs] == ["# Specs\nSAVE15 gives 15%"]
+    assert raw_texts == {str(md): "# Specs\nSAVE15 gives 15%"}
+
+
+def test_create_vector_db_reports_added_chunks(vector_db_path):
+    db, added, removed = create_vector_db([_doc("Discount code SAVE15 gives 15%")])
+    assert (added, removed) == (1, 0)
+    assert db._collection.count() == 1
+
+
+def test_create_vector_db_sync_is_noop_for_unchanged_documents(vector_db_path):
+    docs = [_doc("Discount code SAVE15 gives 15%"), _doc("Express shipping costs $10", "guide.txt")]
+    create_vector_db(docs)
+
+    db, added, removed = create_vector_db(docs)
+
+    assert (added, removed) == (0, 0)
+    assert db._collection.count() == 2
+
+
+def test_create_vector_db_sync_adds_and_removes_changed_chunks(vector_db_path):
+    create_vector_db([_doc("Discount code SAVE15 gives 15%"), _doc("Express shipping costs $10", "guide.txt")])
+
+    db, added, removed = create_vector_db(
+        [_doc("Discount code SAVE20 gives 20%"), _doc("Express shipping costs $10", "guide.txt")]
+    )
+
+    assert (added, removed) == (1, 1)
+    contents = sorted(db.get()["documents"])
+    assert contents == ["Discount code SAVE20 gives 20%", "Express shipping costs $10"]
+
+
+def test_create_vector_db_rebuilds_collection_with_other_metric(vector_db_path):
+    # A KB created before the HNSW settings existed uses Chroma's default l2 space
+    Chroma.from_documents(
+        [_doc("Discount code SAVE15 gives 15%")],
+        ingestion._get_cached_embedding_function(),
+        persist_directory=vector_db_path,
+    )
+
+    db, added, removed = create_vector_db([_doc("Discount code SAVE15 gives 15%")])
+
+    assert db._collection.metadata["hnsw:space"] == "cosine"
+    assert (added, removed) == (1, 0)
+    assert db._collection.count() == 1
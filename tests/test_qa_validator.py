@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from backend.qa_validator import QAValidator, validate_project
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+
+
+def _issues(html, docs=""):
+    validator = QAValidator(html, docs)
+    return [(s["severity"], s["category"], s["issue"]) for s in validator.validate_all()]
+
+
+def _sample_html():
+    return (ASSETS / "checkout.html").read_text(encoding="utf-8")
+
+
+def _sample_docs():
+    return "\n\n".join(
+        (ASSETS / name).read_text(encoding="utf-8")
+        for name in ("product_specs.md", "ui_ux_guide.txt", "api_endpoints.json")
+    )
+
+
+def test_sample_assets_with_docs():
+    assert _issues(_sample_html(), _sample_docs()) == [
+        ("info", "Form Validation", "Name field is not marked as required in HTML."),
+        ("info", "Error Handling", "Missing error message element for 'discount-code' field."),
+    ]
+
+
+def test_sample_assets_without_docs():
+    add_to_cart = ("info", "Documentation", "Button 'Add to Cart' found but not documented.")
+    assert _issues(_sample_html()) == [
+        ("warning", "Form Validation", "Email field requires validation, but no validation rule found in documents."),
+        ("info", "Form Validation", "Name field is not marked as required in HTML."),
+        ("info", "Error Handling", "Missing error message element for 'discount-code' field."),
+        ("warning", "Documentation", "Discount code feature exists in HTML but not documented."),
+        ("warning", "Documentation", "Payment methods found in HTML but not documented."),
+        ("warning", "Documentation", "Shipping options found in HTML but not documented."),
+        add_to_cart,
+        add_to_cart,
+        add_to_cart,
+        ("info", "Documentation", "Button 'Pay Now' found but not documented."),
+    ]
+
+
+def test_empty_or_elementless_html_has_no_suggestions():
+    assert _issues("") == []
+    assert _issues("   \n") == []
+    assert _issues("<p>Nothing to check</p>") == []
+
+
+def test_discount_input_without_apply_button_or_error_element():
+    issues = _issues("<input id='couponCode'><button>Go</button>")
+    assert ("error", "Discount Code", "Discount input found but no 'Apply' button detected.") in issues
+    assert ("warning", "Error Handling", "The HTML does not contain an element for discount error message.") in issues
+
+
+def test_discount_with_apply_button_and_error_element():
+    html = "<input id='discount'><span id='discount-error'></span><button>Apply</button>"
+    assert _issues(html, "discount codes") == []
+
+
+def test_documented_radios_are_not_reported():
+    html = "<input type=radio name=payment value=card><input type=radio name=shippingOpt>"
+    assert _issues(html, "payment and shipping rules") == []
+    assert [i[2] for i in _issues(html)] == [
+        "Payment methods found in HTML but not documented.",
+        "Shipping options found in HTML but not documented.",
+    ]
+
+
+def test_button_coverage_handles_overlapping_labels():
+    html = "<button>Place Order</button><button>Order</button><button>Apply Code</button><button>Pay</button>"
+    undocumented = [i[2] for i in _issues(html, "place order now")]
+    assert undocumented == ["Button 'Apply Code' found but not documented."]
+
+
+def test_format_suggestions_markdown_groups_by_severity():
+    markdown = validate_project("<input id='couponCode'><button>Go</button>")
+    assert markdown.startswith("## 🔍 Quick Fix Suggestions\n\n### 🚨 Critical Issues\n")
+    assert markdown.index("### 🚨 Critical Issues") < markdown.index("### ⚠️ Warnings")
+    assert validate_project("").startswith("✅ **No issues found!**")
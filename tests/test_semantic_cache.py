@@ -0,0 +1,55 @@
+from backend import semantic_cache
+
+
+def test_lookup_misses_on_empty_cache(vector_db_path):
+    assert semantic_cache.lookup("testcases::discount code", namespace="testcases") is None
+
+
+def test_lookup_returns_response_for_equivalent_key(vector_db_path):
+    semantic_cache.store("testcases::discount code", namespace="testcases", response="TC-001")
+    semantic_cache._exact_cache.clear()  # force the Chroma similarity path
+
+    assert semantic_cache.lookup("testcases::Discount Code", namespace="testcases") == "TC-001"
+
+
+def test_lookup_misses_for_unrelated_key(vector_db_path):
+    semantic_cache.store("testcases::discount code", namespace="testcases", response="TC-001")
+    semantic_cache._exact_cache.clear()
+
+    assert semantic_cache.lookup("testcases::shipping rules", namespace="testcases") is None
+
+
+def test_lookup_is_scoped_to_namespace(vector_db_path):
+    semantic_cache.store("discount code", namespace="testcases", response="TC-001")
+    semantic_cache._exact_cache.clear()
+
+    assert semantic_cache.lookup("discount code", namespace="other") is None
+
+
+def test_normalized_exact_layer_only_when_requested(vector_db_path):
+    semantic_cache.store("Enter quantity -1", namespace="testcases", response="A", normalize=True)
+    semantic_cache.store("total < $100", namespace="scripts", response="B")
+
+    assert semantic_cache.lookup("enter quantity 1", namespace="testcases", normalize=True) == "A"
+    assert semantic_cache.lookup("total > $100", namespace="scripts") is None
+
+
+def test_exact_lookup_distinguishes_single_value_changes(vector_db_path):
+    html = "<input id='discount-code'>"
+    save10 = semantic_cache.content_hash("Apply code SAVE10 and expect 10% off", html)
+    save20 = semantic_cache.content_hash("Apply code SAVE20 and expect 20% off", html)
+    semantic_cache.store_exact(save10, "selenium::SAVE10", namespace="selenium", response="script-10")
+
+    assert semantic_cache.lookup_exact(save10) == "script-10"
+    assert semantic_cache.lookup_exact(save20) is None
+
+
+def test_clear_drops_all_responses(vector_db_path):
+    semantic_cache.store("testcases::discount code", namespace="testcases", response="TC-001")
+    digest = semantic_cache.content_hash("case", "<html>")
+    semantic_cache.store_exact(digest, "selenium::case", namespace="selenium", response="script")
+
+    semantic_cache.clear()
+
+    assert semantic_cache.lookup("testcases::discount code", namespace="testcases") is None
+    assert semantic_cache.lookup_exact(digest) is None